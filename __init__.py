@@ -5,9 +5,31 @@ Creates and configures the Flask application with proper configuration loading
 """
 
 from flask import Flask, jsonify
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import logging
+import orjson
 import os
+from apis import dump_json
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    JSON provider that serializes with apis.dump_json
+    so jsonify() and the API endpoints share one set of encoding rules
+    """
+    
+    def dumps(self, obj, **kwargs):
+        """Serialize data as a JSON string, honoring sort_keys, indent and default"""
+        option = 0
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return dump_json(obj, option, kwargs.get('default')).decode()
+    
+    def loads(self, s, **kwargs):
+        """Deserialize JSON from a string or bytes"""
+        return orjson.loads(s)
 
 def create_app(config_name=None):
     """
@@ -23,6 +45,7 @@ def create_app(config_name=None):
     
     # Create Flask application
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)
     
     # Load configuration
     if config_name is None:
@@ -37,6 +60,10 @@ def create_app(config_name=None):
         format='%(asctime)s %(levelname)s %(name)s %(message)s'
     )
     
+    # Initialize database connection pool
+    from database import init_db_pool
+    init_db_pool(app)
+    
     # Initialize CORS
     CORS(app, resources={
         r"/api/*": {
@@ -95,30 +122,33 @@ def register_error_handlers(app):
 def register_root_endpoint(app):
     """Register the root endpoint with API documentation"""
     
+    # The payload only depends on configuration, so build it once
+    root_info = {
+        'message': app.config['API_TITLE'],
+        'version': app.config['API_VERSION'],
+        'environment': os.getenv('FLASK_ENV', 'development'),
+        'endpoints': {
+            'list_customers': '/api/customers',
+            'get_customer': '/api/customers/<id>',
+            'health_check': '/api/health'
+        },
+        'documentation': {
+            'list_customers': {
+                'method': 'GET',
+                'parameters': {
+                    'page': f'Page number (default: 1)',
+                    'limit': f'Items per page (default: {app.config["DEFAULT_PAGE_SIZE"]}, max: {app.config["MAX_PAGE_SIZE"]})',
+                    'search': 'Search in first_name, last_name, or email'
+                }
+            },
+            'get_customer': {
+                'method': 'GET',
+                'description': 'Get customer details with order statistics'
+            }
+        }
+    }
+    
     @app.route('/', methods=['GET'])
     def root():
         """Root endpoint with API information"""
-        return jsonify({
-            'message': app.config['API_TITLE'],
-            'version': app.config['API_VERSION'],
-            'environment': os.getenv('FLASK_ENV', 'development'),
-            'endpoints': {
-                'list_customers': '/api/customers',
-                'get_customer': '/api/customers/<id>',
-                'health_check': '/api/health'
-            },
-            'documentation': {
-                'list_customers': {
-                    'method': 'GET',
-                    'parameters': {
-                        'page': f'Page number (default: 1)',
-                        'limit': f'Items per page (default: {app.config["DEFAULT_PAGE_SIZE"]}, max: {app.config["MAX_PAGE_SIZE"]})',
-                        'search': 'Search in first_name, last_name, or email'
-                    }
-                },
-                'get_customer': {
-                    'method': 'GET',
-                    'description': 'Get customer details with order statistics'
-                }
-            }
-        }), 200
+        return jsonify(root_info), 200
@@ -7,6 +7,27 @@ import csv
 import sys
 import os
 
+# Common UTF-8 characters and their ASCII equivalents
+REPLACEMENTS = {
+    'á': 'a', 'à': 'a', 'ä': 'a', 'â': 'a', 'ã': 'a', 'å': 'a',
+    'é': 'e', 'è': 'e', 'ë': 'e', 'ê': 'e',
+    'í': 'i', 'ì': 'i', 'ï': 'i', 'î': 'i',
+    'ó': 'o', 'ò': 'o', 'ö': 'o', 'ô': 'o', 'õ': 'o',
+    'ú': 'u', 'ù': 'u', 'ü': 'u', 'û': 'u',
+    'ñ': 'n', 'ç': 'c',
+    'Á': 'A', 'À': 'A', 'Ä': 'A', 'Â': 'A', 'Ã': 'A', 'Å': 'A',
+    'É': 'E', 'È': 'E', 'Ë': 'E', 'Ê': 'E',
+    'Í': 'I', 'Ì': 'I', 'Ï': 'I', 'Î': 'I',
+    'Ó': 'O', 'Ò': 'O', 'Ö': 'O', 'Ô': 'O', 'Õ': 'O',
+    'Ú': 'U', 'Ù': 'U', 'Ü': 'U', 'Û': 'U',
+    'Ñ': 'N', 'Ç': 'C',
+    '\u201c': '"', '\u201d': '"', '\u2018': "'", '\u2019': "'",
+    '–': '-', '—': '-', '…': '...'
+}
+
+# Translation table so every line is cleaned in a single pass
+REPLACEMENT_TABLE = str.maketrans(REPLACEMENTS)
+
 def clean_csv_for_sql(input_file, output_file):
     """
     Clean CSV file by removing or replacing non-ASCII characters
@@ -20,38 +41,17 @@ def clean_csv_for_sql(input_file, output_file):
         with open(input_file, 'r', encoding='utf-8', errors='ignore') as infile, \
              open(output_file, 'w', encoding='ascii', errors='ignore', newline='') as outfile:
             
-            # Read the entire content and replace problematic characters
-            content = infile.read()
-            
-            # Replace common UTF-8 characters with ASCII equivalents
-            replacements = {
-                'á': 'a', 'à': 'a', 'ä': 'a', 'â': 'a', 'ã': 'a', 'å': 'a',
-                'é': 'e', 'è': 'e', 'ë': 'e', 'ê': 'e',
-                'í': 'i', 'ì': 'i', 'ï': 'i', 'î': 'i',
-                'ó': 'o', 'ò': 'o', 'ö': 'o', 'ô': 'o', 'õ': 'o',
-                'ú': 'u', 'ù': 'u', 'ü': 'u', 'û': 'u',
-                'ñ': 'n', 'ç': 'c',
-                'Á': 'A', 'À': 'A', 'Ä': 'A', 'Â': 'A', 'Ã': 'A', 'Å': 'A',
-                'É': 'E', 'È': 'E', 'Ë': 'E', 'Ê': 'E',
-                'Í': 'I', 'Ì': 'I', 'Ï': 'I', 'Î': 'I',
-                'Ó': 'O', 'Ò': 'O', 'Ö': 'O', 'Ô': 'O', 'Õ': 'O',
-                'Ú': 'U', 'Ù': 'U', 'Ü': 'U', 'Û': 'U',
-                'Ñ': 'N', 'Ç': 'C',
-                '"': '"', '"': '"', ''': "'", ''': "'",
-                '–': '-', '—': '-', '…': '...'
-            }
-            
-            # Apply replacements
-            for utf_char, ascii_char in replacements.items():
-                if utf_char in content:
-                    chars_replaced += content.count(utf_char)
-                    content = content.replace(utf_char, ascii_char)
-            
-            # Write cleaned content
-            outfile.write(content)
-            
-            # Count rows
-            rows_processed = content.count('\n')
+            # Stream the file line by line instead of reading it all at once
+            for line in infile:
+                rows_processed += 1
+                
+                # Plain ASCII lines have nothing to replace
+                if not line.isascii():
+                    chars_replaced += sum(1 for char in line if char in REPLACEMENTS)
+                    line = line.translate(REPLACEMENT_TABLE)
+                
+                # Write cleaned line
+                outfile.write(line)
             
         print(f"✅ Successfully cleaned CSV file!")
         print(f"   - Rows processed: {rows_processed}")
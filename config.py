@@ -25,15 +25,35 @@ class Config:
     DB_PASSWORD = os.getenv('DB_PASSWORD', '')
     DB_CHARSET = 'utf8mb4'
     DB_COLLATION = 'utf8mb4_unicode_ci'
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 10))
     
     # API Configuration
     API_VERSION = '1.0.0'
     API_TITLE = 'Customer API'
     
-    # Pagination Configuration
+    # Seconds a health check database probe is reused for
+    HEALTH_CHECK_TTL = float(os.getenv('HEALTH_CHECK_TTL', 1.0))
+    
+    # Pagination Configuration (pages are fetched and encoded whole, so
+    # MAX_PAGE_SIZE also bounds per-request memory)
     DEFAULT_PAGE_SIZE = 10
     MAX_PAGE_SIZE = 100
     
+    # Unfiltered customer pages 1..N are cached in-process for TTL seconds
+    CUSTOMER_LIST_CACHE_PAGES = 5
+    CUSTOMER_LIST_CACHE_TTL = int(os.getenv('CUSTOMER_LIST_CACHE_TTL', 30))
+    
+    # Customer totals per search are reused across pages for TTL seconds
+    CUSTOMER_COUNT_CACHE_TTL = int(os.getenv('CUSTOMER_COUNT_CACHE_TTL', 30))
+    
+    # The most recently requested customer detail responses are cached
+    # in-process for TTL seconds
+    CUSTOMER_DETAIL_CACHE_SIZE = 100
+    CUSTOMER_DETAIL_CACHE_TTL = int(os.getenv('CUSTOMER_DETAIL_CACHE_TTL', 60))
+    
+    # Search Configuration (matches MySQL's innodb_ft_min_token_size)
+    FULLTEXT_MIN_WORD_LENGTH = 3
+    
     # CORS Configuration
     CORS_ORIGINS = ["*"]
     CORS_METHODS = ["GET", "POST", "PUT", "DELETE", "OPTIONS"]
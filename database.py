@@ -6,20 +6,76 @@ Handles MySQL database connections using Flask app configuration
 
 import mysql.connector
 from mysql.connector import Error
+from mysql.connector.errors import PoolError
+from mysql.connector.pooling import CNX_POOL_MAXSIZE, MySQLConnectionPool
 import logging
 import os
-from flask import current_app, has_app_context
+import threading
+import time
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Shared connection pool, created by init_db_pool() at app startup. If the
+# database is unreachable then, get_db_connection() retries creating it at
+# most every POOL_RETRY_INTERVAL seconds and uses direct connections meanwhile.
+_pool = None
+_pool_size = 10
+_pool_retry_at = 0.0
+_pool_lock = threading.Lock()
+POOL_RETRY_INTERVAL = 5.0
+
+def init_db_pool(app):
+    """Create the shared connection pool for the application"""
+    global _pool_size
+    pool_size = app.config.get('DB_POOL_SIZE', 10)
+    if not 1 <= pool_size <= CNX_POOL_MAXSIZE:
+        # mysql-connector rejects pools outside this range
+        logger.warning(f"DB_POOL_SIZE={pool_size} is out of range, using 1..{CNX_POOL_MAXSIZE}")
+        pool_size = min(max(pool_size, 1), CNX_POOL_MAXSIZE)
+    _pool_size = pool_size
+    return _create_pool()
+
+def _create_pool():
+    """Create the connection pool, scheduling a retry when the database is down"""
+    global _pool, _pool_retry_at
+    try:
+        _pool = MySQLConnectionPool(
+            pool_name="api",
+            pool_size=_pool_size,
+            # Endpoints only run SELECTs and keep no session state, so skip the
+            # COM_RESET_CONNECTION round-trip when a connection is returned
+            pool_reset_session=False,
+            **_get_env_db_config()
+        )
+        logger.info(f"Database connection pool created (size={_pool.pool_size})")
+    except Error as e:
+        _pool = None
+        _pool_retry_at = time.monotonic() + POOL_RETRY_INTERVAL
+        logger.error(f"Database connection pool error: {e}")
+    return _pool
+
 def get_db_connection():
-    """Create and return a database connection using environment variables"""
+    """Return a database connection, taken from the pool when available"""
     try:
-        # Use environment variables directly for simplicity and reliability
-        db_config = _get_env_db_config()
-        connection = mysql.connector.connect(**db_config)
-        return connection
+        if _pool is None and time.monotonic() >= _pool_retry_at:
+            with _pool_lock:
+                if _pool is None and time.monotonic() >= _pool_retry_at:
+                    _create_pool()
+        
+        if _pool is None:
+            # Use environment variables directly for simplicity and reliability
+            db_config = _get_env_db_config()
+            return mysql.connector.connect(**db_config)
+        
+        # The pool already pings each connection on checkout and reconnects
+        # dropped ones, so no extra is_connected() round-trip is needed here
+        try:
+            return _pool.get_connection()
+        except PoolError:
+            # Pool exhausted under a burst: serve the request with a direct connection
+            logger.warning("Database connection pool exhausted, opening a direct connection")
+            return mysql.connector.connect(**_get_env_db_config())
     except Error as e:
         logger.error(f"Database connection error: {e}")
         return None
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+SQL queries module - SQL constants used by the API endpoints
+Every statement is built once at import time so handlers only pick a constant
+and execute it with bound parameters on a plain buffered cursor. Server-side
+prepared statements are not used: mysql-connector prepares on execute and
+deallocates on close, adding a round-trip to every short-lived cursor.
+"""
+
+# Customer listing, keyed by (fields, search mode). The page of users is picked
+# first, so the summary projection is served from the idx_users_list covering
+# index, and 'full' looks up order counts only for the rows on the page.
+# Rows are fetched positionally; CUSTOMER_LIST_FIELDS names their columns in
+# order, and a window total, when selected, always comes last.
+_CUSTOMER_LIST_COLUMNS = {
+    'summary': ('id', 'first_name', 'last_name', 'email'),
+    'full': ('id', 'first_name', 'last_name', 'email', 'age', 'gender',
+             'state', 'city', 'country', 'timestamp')
+}
+
+CUSTOMER_LIST_FIELDS = {
+    'summary': _CUSTOMER_LIST_COLUMNS['summary'],
+    'full': _CUSTOMER_LIST_COLUMNS['full'] + ('order_count',)
+}
+
+def _customer_list_query(fields, condition, page_clause, with_total):
+    """Compose a customer listing statement (only called at import time)"""
+    columns = _CUSTOMER_LIST_COLUMNS[fields]
+    total = ", COUNT(*) OVER () as total_count" if with_total else ""
+    outer_total = ", p.total_count" if with_total else ""
+    page_query = f"""
+        SELECT {', '.join('u.' + column for column in columns)}{total}
+        FROM users u{condition}{page_clause}
+    """
+    if fields == 'summary':
+        return page_query
+    return f"""
+        SELECT {', '.join('p.' + column for column in columns)},
+               (SELECT COUNT(*) FROM orders o WHERE o.user_id = p.id) as order_count{outer_total}
+        FROM ({page_query}) p
+        ORDER BY p.id
+    """
+
+# Most search words too short for the FULLTEXT index that are matched with
+# LIKE; build_search_terms drops any beyond this
+MAX_LIKE_WORDS = 3
+
+_FULLTEXT_CONDITION = "MATCH(first_name, last_name, email) AGAINST (%s IN BOOLEAN MODE)"
+_LIKE_CONDITION = "(first_name LIKE %s OR last_name LIKE %s OR email LIKE %s)"
+
+# Text searches are keyed by ('fulltext' or 'like', number of LIKE words)
+_CUSTOMER_SEARCH_CONDITIONS = {
+    None: "",
+    # Exact id / email lookups seek the primary key or idx_users_email
+    'id': " WHERE id = %s",
+    'email': " WHERE email = %s",
+    # Served by the ft_users_name_email FULLTEXT index; each short word is
+    # ANDed in as a LIKE on any of the columns, filtering the matched rows
+    **{
+        ('fulltext', words): " WHERE " + " AND ".join((_FULLTEXT_CONDITION,) + (_LIKE_CONDITION,) * words)
+        for words in range(MAX_LIKE_WORDS + 1)
+    },
+    # Only a term with no word long enough for the index falls back to a LIKE scan
+    **{
+        ('like', words): " WHERE " + " AND ".join((_LIKE_CONDITION,) * words)
+        for words in range(1, MAX_LIKE_WORDS + 1)
+    }
+}
+
+SQL_COUNT_CUSTOMERS = {
+    mode: "SELECT COUNT(*) as total FROM users" + condition
+    for mode, condition in _CUSTOMER_SEARCH_CONDITIONS.items()
+}
+
+# Page-number listing, keyed by (fields, search mode, with_total). With a
+# total, the count over all matches comes back on every row as a window count
+# so no separate COUNT round-trip is needed; without one (the total is already
+# cached) the window, which has to visit every match, is skipped.
+SQL_LIST_CUSTOMERS = {
+    (fields, mode, with_total): _customer_list_query(
+        fields, condition, " ORDER BY u.id LIMIT %s OFFSET %s", with_total
+    )
+    for fields in _CUSTOMER_LIST_COLUMNS
+    for mode, condition in _CUSTOMER_SEARCH_CONDITIONS.items()
+    for with_total in (False, True)
+}
+
+SQL_LIST_CUSTOMERS_AFTER = {
+    (fields, mode): _customer_list_query(
+        fields, condition,
+        (" AND" if condition else " WHERE") + " u.id > %s ORDER BY u.id LIMIT %s",
+        with_total=False
+    )
+    for fields in _CUSTOMER_LIST_COLUMNS
+    for mode, condition in _CUSTOMER_SEARCH_CONDITIONS.items()
+}
+
+# Customer details: the customer row joined with one row of order statistics
+# per status, so a single round-trip answers the whole endpoint. The first
+# CUSTOMER_DETAILS_WIDTH columns are the customer; the rest are the stats
+# (NULL when the customer has no orders). Both parts are unpacked
+# positionally by get_customer_details and summarize_order_stats. Rows are
+# ordered by status so the ETag hashed from them is stable.
+# The statistics are served index-only by idx_orders_user_status; the hint
+# keeps the optimizer from picking idx_orders_user_created, which is not
+# covering (EXPLAIN should show "Using index").
+_CUSTOMER_DETAIL_COLUMNS = (
+    'id', 'first_name', 'last_name', 'email', 'age', 'gender',
+    'state', 'address', 'postal_code', 'city', 'country',
+    'latitude', 'longitude', 'search_term', 'timestamp'
+)
+
+CUSTOMER_DETAILS_WIDTH = len(_CUSTOMER_DETAIL_COLUMNS)
+
+SQL_CUSTOMER_DETAILS = f"""
+    SELECT {', '.join('u.' + column for column in _CUSTOMER_DETAIL_COLUMNS)},
+           s.status, s.order_count, s.total_items,
+           s.first_order_date, s.last_order_date
+    FROM users u
+    LEFT JOIN (
+        SELECT status,
+               COUNT(*) as order_count,
+               SUM(num_of_item) as total_items,
+               MIN(created_at) as first_order_date,
+               MAX(created_at) as last_order_date
+        FROM orders USE INDEX (idx_orders_user_status)
+        WHERE user_id = %s
+        GROUP BY status
+    ) s ON TRUE
+    WHERE u.id = %s
+    ORDER BY s.status
+"""
+
+# Customer orders, keyed by whether a status filter is applied. Pages are read
+# in index order from idx_orders_user_created, or from idx_orders_user_status
+# when filtering by status, so no filesort is needed.
+# The LEFT JOIN yields a single row with NULL order columns when the customer
+# has no (matching) orders, so existence is checked in the same round-trip.
+def _customer_orders_select(with_total):
+    """Compose the customer orders SELECT (only called at import time)"""
+    total = ",\n           COUNT(o.order_id) OVER () as total_count" if with_total else ""
+    return f"""
+    SELECT u.id, u.first_name, u.last_name,
+           o.order_id, o.user_id, o.status, o.gender, o.created_at,
+           o.returned_at, o.shipped_at, o.delivered_at, o.num_of_item{total}
+    FROM users u
+    LEFT JOIN orders o ON o.user_id = u.id
+"""
+
+# Status is compared directly: the orders table's utf8mb4_0900_ai_ci collation
+# is already case-insensitive, and avoiding LOWER() keeps the index usable
+_ORDER_STATUS_CONDITIONS = {
+    False: "",
+    True: " AND o.status = %s"
+}
+
+# Page-number listing: every row carries the total as a window count
+SQL_CUSTOMER_ORDERS = {
+    filtered: _customer_orders_select(with_total=True) + condition + """
+        WHERE u.id = %s
+        ORDER BY o.created_at DESC, o.order_id DESC LIMIT %s OFFSET %s
+    """
+    for filtered, condition in _ORDER_STATUS_CONDITIONS.items()
+}
+
+# Keyset pages, keyed by (status filtered, cursor has a NULL created_at).
+# created_at is nullable and NULLs sort last in DESC order, so a dated cursor
+# also admits every undated order, and an undated cursor seeks by order_id
+# among the undated ones only. The dated seek is spelled out rather than
+# written as a row comparison so it resolves to ranges on
+# idx_orders_user_created; EXPLAIN should show type "range" on that key and
+# no filesort. No window total is selected: it would have to
+# read every remaining order before the LIMIT applies, so the total comes
+# from SQL_COUNT_CUSTOMER_ORDERS when requested.
+_ORDER_SEEK_CONDITIONS = {
+    False: (" AND (o.created_at < %s OR (o.created_at = %s AND o.order_id < %s)"
+            " OR o.created_at IS NULL)"),
+    True: " AND o.created_at IS NULL AND o.order_id < %s"
+}
+
+SQL_CUSTOMER_ORDERS_AFTER = {
+    (filtered, undated): _customer_orders_select(with_total=False) + condition + seek + """
+        WHERE u.id = %s
+        ORDER BY o.created_at DESC, o.order_id DESC LIMIT %s
+    """
+    for filtered, condition in _ORDER_STATUS_CONDITIONS.items()
+    for undated, seek in _ORDER_SEEK_CONDITIONS.items()
+}
+
+SQL_COUNT_CUSTOMER_ORDERS = {
+    False: "SELECT COUNT(*) as total FROM orders WHERE user_id = %s",
+    True: "SELECT COUNT(*) as total FROM orders WHERE user_id = %s AND status = %s"
+}
+
+SQL_CUSTOMER_NAME = "SELECT id, first_name, last_name FROM users WHERE id = %s"
+
+# Order details
+SQL_ORDER_DETAILS = """
+    SELECT o.order_id, o.user_id, o.status, o.gender, o.created_at,
+           o.returned_at, o.shipped_at, o.delivered_at, o.num_of_item,
+           u.first_name, u.last_name, u.email, u.age, u.city, u.state, u.country
+    FROM orders o
+    LEFT JOIN users u ON o.user_id = u.id
+    WHERE o.order_id = %s
+"""
@@ -174,7 +174,7 @@ class CustomerDashboard {
         this.hideError();
 
         try {
-            let url = `${this.apiBaseUrl}/customers?page=${this.currentPage}&limit=${this.pageSize}`;
+            let url = `${this.apiBaseUrl}/customers?page=${this.currentPage}&limit=${this.pageSize}&fields=full&include_total=1`;
             
             if (this.searchQuery) {
                 url += `&search=${encodeURIComponent(this.searchQuery)}`;
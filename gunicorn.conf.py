@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+Gunicorn configuration - Production server settings
+Threaded workers let each process overlap many database waits; every worker
+opens its own connection pool, sized to match its thread count
+"""
+
+import multiprocessing
+import os
+
+# Server socket
+bind = f"{os.getenv('FLASK_HOST', '0.0.0.0')}:{os.getenv('FLASK_PORT', 5000)}"
+
+# Worker processes: requests are I/O bound, so a few processes with many
+# threads each serve far more concurrent requests than sync workers
+worker_class = 'gthread'
+workers = int(os.getenv('GUNICORN_WORKERS', min(multiprocessing.cpu_count() * 2 + 1, 8)))
+
+# One thread per pooled connection, so threads never queue for the pool
+# (mysql-connector caps a pool at 32 connections)
+threads = int(os.getenv('GUNICORN_THREADS', min(int(os.getenv('DB_POOL_SIZE', 10)), 32)))
+
+# The pool is created in create_app; loading the app after fork gives every
+# worker its own connections instead of sharing forked sockets
+preload_app = False
+
+timeout = 30
+keepalive = 5
@@ -0,0 +1,2 @@
+-- FULLTEXT index backing the customer search in GET /api/customers
+ALTER TABLE users ADD FULLTEXT INDEX ft_users_name_email (first_name, last_name, email);
@@ -0,0 +1,2 @@
+-- Covering index for the default (summary) projection of GET /api/customers
+CREATE INDEX idx_users_list ON users (id, first_name, last_name, email);
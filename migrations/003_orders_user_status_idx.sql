@@ -0,0 +1,2 @@
+-- Covering index for the per-status order statistics in GET /api/customers/<id>
+CREATE INDEX idx_orders_user_status ON orders (user_id, status, created_at, num_of_item);
@@ -0,0 +1,4 @@
+-- Index order matches ORDER BY created_at DESC, order_id DESC in
+-- GET /api/customers/<id>/orders. Status-filtered pages use the
+-- (user_id, status, created_at) prefix of idx_orders_user_status (003).
+CREATE INDEX idx_orders_user_created ON orders (user_id, created_at DESC, order_id DESC);
@@ -0,0 +1,2 @@
+-- Exact email lookups from GET /api/customers?search=<email>
+CREATE INDEX idx_users_email ON users (email);
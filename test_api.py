@@ -68,6 +68,9 @@ def main():
         ("GET", "/api/customers", 200),
         ("GET", "/api/customers", 200, {"page": 1, "limit": 5}),
         ("GET", "/api/customers", 200, {"page": 1, "limit": 10, "search": "test"}),
+        ("GET", "/api/customers", 200, {"page": 2, "limit": 5, "include_total": 1}),
+        ("GET", "/api/customers", 200, {"cursor": "MQ", "limit": 5}),  # Cursor after id 1
+        ("GET", "/api/customers", 200, {"limit": 5, "fields": "full"}),
         
         # Customer details (test with ID 1, might not exist but should handle gracefully)
         ("GET", "/api/customers/1", None),  # Could be 200 or 404
@@ -77,6 +80,10 @@ def main():
         ("GET", "/api/customers/-1", 400),     # Invalid ID
         ("GET", "/api/customers/abc", 404),    # Non-numeric ID (Flask handles this)
         ("GET", "/api/customers/99999", 404),  # Non-existent customer
+        ("GET", "/api/customers", 400, {"cursor": "abc"}),  # Invalid cursor
+        ("GET", "/api/customers", 400, {"page": "abc"}),    # Non-numeric page
+        ("GET", "/api/customers", 400, {"limit": 1000}),    # Limit above maximum
+        ("GET", "/api/customers/1/orders", 400, {"page": "abc"}),  # Non-numeric orders page
     ]
     
     passed = 0